@@ -1,17 +1,24 @@
 import argparse
-import json
+import asyncio
 import logging
 import multiprocessing
+import random
 import re
 import time
 import coloredlogs
 import requests
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
 from lxml import html
 from .config import RESERVED_WORDS
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    from json import loads as json_loads
+
 logger = logging.getLogger(__name__)
 coloredlogs.install(level='INFO', fmt='%(message)s', logger=logger)
 
@@ -19,12 +26,23 @@ PREMIUM_USER = 'This account is already subscribed to Telegram Premium.'
 CHANNEL = 'Please enter a username assigned to a user.'
 NOT_FOUND = 'No Telegram users found.'
 
+# Compiled once instead of on every check
+USERNAME_RE = re.compile(r'[a-zA-Z][a-zA-Z0-9_]{4,31}')
+AJINIT_RE = re.compile(r'ajInit\((\{.*?})\);', re.DOTALL)
+
+# Seconds to reuse the ajInit API URL; it is also dropped as soon as Fragment rejects it
+API_URL_TTL = 3600
+
 class TelegramUsernameChecker:
     def __init__(self, file_path=None, verbose=False):
         self.usernames = set()
         self.session = requests.Session()
+        # Pooled keep-alive connections; retries are handled in check_fragment_api
+        self.session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=0))
         self.file_path = file_path
         self.verbose = verbose
+        self._api_url = None
+        self._api_url_expiry = 0
 
     def load(self):
         if not self.file_path:
@@ -37,19 +55,20 @@ class TelegramUsernameChecker:
             return False
 
         try:
+            # Stream line by line into the set instead of materializing the whole file
             if parsed_url.netloc:
-                response = requests.get(self.file_path)
-                response.raise_for_status()
-                content = response.text.strip()
+                with self.session.get(self.file_path, stream=True) as response:
+                    response.raise_for_status()
+                    lines = (line.decode('utf-8', errors='ignore') for line in response.iter_lines())
+                    self.usernames = self._normalize(lines)
             else:
                 with open(self.file_path, 'r') as f:
-                    content = f.read().strip()
+                    self.usernames = self._normalize(f)
 
-            if not content:
+            if not self.usernames:
                 logger.error('File is empty or contains only whitespace.')
                 return False
 
-            self.usernames = set(line.strip() for line in content.splitlines() if line.strip())
             logger.debug(f'Usernames loaded: {len(self.usernames)}')
             return True
 
@@ -57,45 +76,56 @@ class TelegramUsernameChecker:
             logger.exception(f"Error loading usernames: {e}")
             return False
 
+    @staticmethod
+    def _normalize(lines):
+        """Strip, drop a leading @ and lowercase; filter afterwards so a bare '@' is skipped"""
+        names = (line.strip().lstrip('@').lower() for line in lines)
+        return {name for name in names if name}
+
     def get_api_url(self):
+        if self._api_url and time.monotonic() < self._api_url_expiry:
+            return self._api_url
         scripts = html.fromstring(self.session.get('https://fragment.com').content).xpath('//script/text()')
-        pattern = re.compile(r'ajInit\((\{.*?})\);', re.DOTALL)
-        script = next((script for script in scripts if pattern.search(script)), None)
-        if script:
-            api_url = f'https://fragment.com{json.loads(pattern.search(script).group(1)).get("apiUrl")}'
+        match = next(filter(None, map(AJINIT_RE.search, scripts)), None)
+        if match:
+            api_url = f'https://fragment.com{json_loads(match.group(1)).get("apiUrl")}'
+            self._api_url, self._api_url_expiry = api_url, time.monotonic() + API_URL_TTL
             return api_url
 
     def get_user(self, username, api_url):
         search_recipient_params = {'query': username, 'months': 3, 'method': 'searchPremiumGiftRecipient'}
         response = self.session.post(api_url, data=search_recipient_params)
-        error = response.json().get('error')
+        error = json_loads(response.content).get('error')
         return error
 
     def get_telegram_web_user(self, username):
         response = self.session.get(f'https://t.me/{username}')
-        text = f"You can contact @{username} right away."
-        return text in html.fromstring(response.content)
+        # Byte search on the raw page; testing `in` on a parsed element never matched text
+        return f"You can contact @{username} right away.".encode() in response.content
 
     def check_fragment_api(self, username, count=6):
-        if count == 0:
-            return
-        self.session.headers.pop('Connection', None)
-        api_url = self.get_api_url()
-        if not api_url:
-            logger.error(f'@{username} 💔 API URL not found')
-            return
         search_auctions = {'type': 'usernames', 'query': username, 'method': 'searchAuctions'}
-        response = self.session.post(api_url, data=search_auctions)
-        response_data = response.json()
-
-        if not isinstance(response_data, dict):
-            logger.debug(f'@{username} 💔 Response is not a dict (too many requests. retrying {count} ...)')
-            time.sleep(10)
-            return self.check_fragment_api(username, count - 1)
-        if not response_data.get('html'):
-            logger.debug(f'@{username} 💔 Request to fragment API failed. Retrying {count} ...')
-            time.sleep(6)
-            return self.check_fragment_api(username, count - 1)
+        for attempt in range(count):
+            api_url = self.get_api_url()
+            if not api_url:
+                logger.error(f'@{username} 💔 API URL not found')
+                return
+            response = self.session.post(api_url, data=search_auctions)
+            response_data = json_loads(response.content)
+
+            if not isinstance(response_data, dict):
+                logger.debug(f'@{username} 💔 Response is not a dict (too many requests. retrying {count - attempt} ...)')
+            elif not response_data.get('html'):
+                logger.debug(f'@{username} 💔 Request to fragment API failed. Retrying {count - attempt} ...')
+            else:
+                break
+            # The API hash may have rotated; fetch the URL again on the next attempt
+            self._api_url = None
+            if attempt < count - 1:
+                # Exponential backoff with jitter instead of fixed 10s/6s sleeps
+                time.sleep(random.uniform(0.5, 1.5) * (2 ** attempt))
+        else:
+            return
         tree = html.fromstring(response_data.get('html'))
         xpath_expression = '//div[contains(@class, "tm-value")]'
         username_data = tree.xpath(xpath_expression)[:3]
@@ -139,7 +169,7 @@ class TelegramUsernameChecker:
 
     async def check_username(self, username):
         msg = f'@{username} '
-        if not re.compile(r'^[a-zA-Z][a-zA-Z0-9_]{4,31}$').match(username):
+        if not USERNAME_RE.fullmatch(username):
             logger.info(msg + '💀  Not allowed')
             return False
 
@@ -148,28 +178,22 @@ class TelegramUsernameChecker:
             return False
 
         try:
-            result = self.check_fragment_api(username.lower())
-            time.sleep(5)  # Keep original delay
-            return result
+            # Run the blocking requests-based check off the event loop
+            return await asyncio.to_thread(self.check_fragment_api, username.lower())
         except Exception as e:
             logger.error(f"Error checking username {username}: {e}")
             return False
 
     async def batch_check(self, usernames, batch_size=5):
-        results = []
-        for i in range(0, len(usernames), batch_size):
-            batch = usernames[i:i + batch_size]
-
-            # Check each username in batch
-            batch_results = []
-            for username in batch:
-                result = await self.check_username(username)
-                batch_results.append(result)
+        # Keep batch_size checks in flight at once; each runs in its own worker thread
+        semaphore = asyncio.Semaphore(batch_size)
 
-            results.extend(batch_results)
-            await asyncio.sleep(2)  # Delay between batches
+        async def check(username):
+            async with semaphore:
+                return await self.check_username(username)
 
-        return results
+        # gather keeps results in input order
+        return await asyncio.gather(*(check(username) for username in usernames))
 
     def run(self, multithread=True):
         return asyncio.run(self.batch_check(list(self.usernames)))
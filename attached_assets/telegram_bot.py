@@ -3,9 +3,9 @@ import os
 import sys
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, CallbackContext
-import asyncio
-import io
+import itertools
 from contextlib import redirect_stderr
+from contextvars import ContextVar
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from checker.main import TelegramUsernameChecker
@@ -17,6 +17,30 @@ TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 if not TOKEN:
     raise ValueError("TELEGRAM_BOT_TOKEN environment variable is not set")
 
+# Log lines captured for the request running in the current task
+_active_buffer: ContextVar = ContextVar('_active_buffer', default=None)
+
+class CaptureHandler(logging.Handler):
+    """Root handler that appends records to the active request's buffer."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        buffer = _active_buffer.get()
+        if buffer is not None:
+            buffer.append(self.format(record))
+
+capture_handler = CaptureHandler(logging.INFO)
+capture_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.getLogger().addHandler(capture_handler)
+
+# Send captured results once this many lines have accumulated, then once at the end
+REPLY_BATCH_LINES = 10
+
+async def flush_replies(update: Update, lines: list) -> None:
+    """Send accumulated check output as a single message and clear the buffer."""
+    if lines:
+        await update.message.reply_text("\n".join(lines))
+        lines.clear()
+
 async def start(update: Update, context: CallbackContext) -> None:
     """Send a message when the command /start is issued."""
     welcome_msg = (
@@ -48,55 +72,50 @@ async def check_username(update: Update, context: CallbackContext) -> None:
     """Check single or multiple usernames availability."""
     text = update.message.text.strip()
 
-    # Split text into usernames, handle multiple formats and clean them
-    usernames = []
-    for name in text.split():
-        # Remove @ if present and clean
-        cleaned_name = name.lstrip('@').strip()
-        if cleaned_name:  # Only add non-empty usernames
-            usernames.append(cleaned_name)
+    # Split text into usernames, strip @, lowercase and drop duplicates
+    usernames = list(dict.fromkeys(
+        name.lstrip('@').strip().lower() for name in text.split() if name.lstrip('@').strip()
+    ))
 
     if len(usernames) > 30:
         await update.message.reply_text("⚠️ Maksimal 30 username dalam satu pesan. Akan mengecek 30 username pertama.")
         usernames = usernames[:30]
 
-    # Create a custom handler that writes to a string buffer
-    log_buffer = io.StringIO()
-    handler = logging.StreamHandler(log_buffer)
-    handler.setLevel(logging.INFO)
-    handler.setFormatter(logging.Formatter('%(message)s'))
-
-    # Add the handler to the logger
-    root_logger = logging.getLogger()
-    root_logger.addHandler(handler)
+    # Capture log output of this request only, isolated from concurrent users
+    captured = []
+    token = _active_buffer.set(captured)
 
     try:
         checker = TelegramUsernameChecker(verbose=True)
 
+        pending = []
+
         for username in usernames:
             # Reset buffer before each check
-            log_buffer.truncate(0)
-            log_buffer.seek(0)
+            captured.clear()
 
             try:
                 result = await checker.check_username(username)
                 # Get the captured output
-                log_output = log_buffer.getvalue().strip()
+                log_output = "\n".join(captured).strip()
                 if log_output:
-                    await update.message.reply_text(log_output)
+                    pending.append(log_output)
 
-                await asyncio.sleep(2)  # Delay between checks
+                if len(pending) >= REPLY_BATCH_LINES:
+                    await flush_replies(update, pending)
 
             except Exception as e:
                 logger.error(f"Error checking username {username}: {e}")
                 continue
 
+        await flush_replies(update, pending)
+
     except Exception as e:
         logger.error(f"Error in batch check: {e}")
         await update.message.reply_text(f"❌ Error checking usernames: {str(e)}")
     finally:
         # Clean up
-        root_logger.removeHandler(handler)
+        _active_buffer.reset(token)
 
 async def check_usernames_list(update: Update, context: CallbackContext) -> None:
     """Check multiple usernames from a file URL."""
@@ -110,15 +129,9 @@ async def check_usernames_list(update: Update, context: CallbackContext) -> None
     file_url = context.args[0]
     await update.message.reply_text("📥 Loading usernames from file...")
 
-    # Create a custom handler that writes to a string buffer
-    log_buffer = io.StringIO()
-    handler = logging.StreamHandler(log_buffer)
-    handler.setLevel(logging.INFO)
-    handler.setFormatter(logging.Formatter('%(message)s'))
-
-    # Add the handler to the logger
-    root_logger = logging.getLogger()
-    root_logger.addHandler(handler)
+    # Capture log output of this request only, isolated from concurrent users
+    captured = []
+    token = _active_buffer.set(captured)
 
     try:
         checker = TelegramUsernameChecker(file_path=file_url, verbose=True)
@@ -130,32 +143,37 @@ async def check_usernames_list(update: Update, context: CallbackContext) -> None
         await update.message.reply_text("✅ Usernames loaded. Starting checks...")
 
         # Limit number of usernames to check
-        usernames = list(checker.usernames)[:30]
+        # load() already normalizes and dedupes, so take 30 without copying the set
+        usernames = list(itertools.islice(checker.usernames, 30))
+
+        pending = []
 
         for username in usernames:
             # Reset buffer before each check
-            log_buffer.truncate(0)
-            log_buffer.seek(0)
+            captured.clear()
 
             try:
                 result = await checker.check_username(username)
                 # Get the captured output
-                log_output = log_buffer.getvalue().strip()
+                log_output = "\n".join(captured).strip()
                 if log_output:
-                    await update.message.reply_text(log_output)
+                    pending.append(log_output)
 
-                await asyncio.sleep(2)  # Delay between checks
+                if len(pending) >= REPLY_BATCH_LINES:
+                    await flush_replies(update, pending)
 
             except Exception as e:
                 logger.error(f"Error checking username {username}: {e}")
                 continue
 
+        await flush_replies(update, pending)
+
     except Exception as e:
         logger.error(f"Error in batch check: {e}")
         await update.message.reply_text(f"❌ Error checking usernames: {str(e)}")
     finally:
         # Clean up
-        root_logger.removeHandler(handler)
+        _active_buffer.reset(token)
 
 def main() -> None:
     """Start the bot."""
@@ -1,6 +1,8 @@
 
+import io
 import logging
 import os
+from contextlib import redirect_stderr
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, CallbackContext
 import sys
@@ -44,10 +46,6 @@ async def check_username(update: Update, context: CallbackContext) -> None:
     checker = TelegramUsernameChecker(file_path=None, verbose=True)
     
     # Setup logging to capture output
-    import io
-    import logging
-    from contextlib import redirect_stderr
-    
     # Create a custom handler that writes to a string buffer
     log_buffer = io.StringIO()
     handler = logging.StreamHandler(log_buffer)
@@ -119,9 +117,6 @@ update: Update, context: CallbackContext) -> None:
         limited_usernames = list(checker.usernames)[:10]  # Limit to 10 usernames
         
         # Setup logging to capture output
-        import io
-        import logging
-        
         # Create a custom handler that writes to a string buffer
         log_buffer = io.StringIO()
         handler = logging.StreamHandler(log_buffer)
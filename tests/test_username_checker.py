@@ -0,0 +1,166 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import aiohttp
+
+import username_checker as uc
+
+
+class StubResponse:
+    def __init__(self, status=200, body=b'', gate=None):
+        self.status = status
+        self.headers = {}
+        self._body = body
+        self._gate = gate
+
+    async def __aenter__(self):
+        if self._gate is not None:
+            await self._gate.wait()
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+
+class StubSession:
+    """Fragment and t.me stand-in: every searched name is 'Unavailable' and has no t.me page"""
+
+    closed = False
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.posts = []
+        self.statuses = {}
+        self.errors = {}
+
+    def get(self, url, **kwargs):
+        if url == 'https://fragment.com':
+            return StubResponse(body=b'<script>ajInit({"apiUrl":"/api?hash=1"});</script>')
+        return StubResponse(status=404)
+
+    def post(self, url, data=None, **kwargs):
+        username = data['query']
+        self.posts.append(username)
+        if username in self.errors:
+            raise self.errors[username]
+        cells = ''.join(
+            f'<div class="tm-value">{value}</div>' for value in (f'@{username}', 'Unknown', 'Unavailable')
+        )
+        body = json.dumps({'html': cells}).encode()
+        return StubResponse(self.statuses.get(username, 200), body, self.gate)
+
+    async def close(self):
+        self.closed = True
+
+
+class CheckFragmentApiTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await uc.close_session()
+        self.session = StubSession()
+        uc._SESSION = self.session
+        self.checker = uc.TelegramUsernameChecker()
+
+    async def asyncTearDown(self):
+        await uc.close_session()
+
+    async def _start(self, username, count=1):
+        """Start callers and let them reach the (gated) Fragment request"""
+        callers = [asyncio.create_task(self.checker.check_fragment_api(username)) for _ in range(count)]
+        while not self.session.posts:
+            await asyncio.sleep(0)
+        return callers
+
+    async def test_concurrent_callers_share_one_request(self):
+        self.session.gate.clear()
+        callers = await self._start('freeshared', count=3)
+        self.assertEqual(len(uc._inflight), 1)
+
+        self.session.gate.set()
+        self.assertEqual(await asyncio.gather(*callers), [True, True, True])
+        self.assertEqual(self.session.posts, ['freeshared'])
+
+        # A later caller is served from the result cache
+        self.assertTrue(await self.checker.check_fragment_api('freeshared'))
+        self.assertEqual(self.session.posts, ['freeshared'])
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        self.session.gate.clear()
+        first, second = await self._start('freeshared', count=2)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        self.session.gate.set()
+
+        self.assertTrue(await second)
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+        self.assertEqual(self.session.posts, ['freeshared'])
+
+    async def test_last_caller_leaving_cancels_check(self):
+        self.session.gate.clear()
+        caller, = await self._start('freeabandoned')
+        check = uc._inflight['freeabandoned']
+
+        caller.cancel()
+        await asyncio.wait([check])
+
+        self.assertTrue(check.cancelled())
+        self.assertNotIn('freeabandoned', uc._inflight)
+        self.assertNotIn('freeabandoned', uc._results_cache)
+
+    async def test_caller_arriving_after_cancel_gets_fresh_check(self):
+        self.session.gate.clear()
+        caller, = await self._start('freeagain')
+        caller.cancel()
+        await asyncio.sleep(0)
+
+        # Same tick as the cancellation: must not attach to the dying check
+        replacement = asyncio.create_task(self.checker.check_fragment_api('freeagain'))
+        await asyncio.sleep(0)
+        self.session.gate.set()
+
+        self.assertTrue(await replacement)
+        self.assertEqual(self.session.posts, ['freeagain', 'freeagain'])
+
+    async def test_failures_are_not_cached(self):
+        self.session.statuses['freerefused'] = 403
+        self.session.errors['freeoffline'] = aiohttp.ClientConnectionError('connection reset')
+
+        self.assertIsNone(await self.checker.check_fragment_api('freerefused'))
+        self.assertIsNone(await self.checker.check_fragment_api('freeoffline', retries=1))
+        self.assertNotIn('freerefused', uc._results_cache)
+        self.assertNotIn('freeoffline', uc._results_cache)
+
+        # Once Fragment answers, the name is checked again rather than served a cached None
+        del self.session.statuses['freerefused']
+        self.assertTrue(await self.checker.check_fragment_api('freerefused'))
+        self.assertEqual(self.session.posts, ['freerefused', 'freeoffline', 'freerefused'])
+
+    async def test_expired_results_are_refetched_and_evicted(self):
+        uc._results_cache['freeexpired'] = (False, 0.0)
+        uc._results_cache['freeolder'] = (False, 0.0)
+
+        self.assertTrue(await self.checker.check_fragment_api('freeexpired'))
+        self.assertEqual(list(uc._results_cache), ['freeexpired'])
+        self.assertTrue(uc._results_cache['freeexpired'][0])
+
+    async def test_eviction_respects_max_size(self):
+        with mock.patch.object(uc, '_RESULT_CACHE_MAX', 2):
+            for username in ('freefirst', 'freesecond', 'freethird'):
+                await self.checker.check_fragment_api(username)
+
+        self.assertEqual(list(uc._results_cache), ['freesecond', 'freethird'])
+
+
+if __name__ == '__main__':
+    unittest.main()
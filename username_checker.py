@@ -1,17 +1,24 @@
 import aiohttp
 import asyncio
+import atexit
 import logging
 import logging.handlers
 import re
-import json
 import os
 import time
 import math
 import random
-from lxml import html
-from typing import Optional, Dict, Set, Union
+from functools import partial
+from html import unescape
+from queue import SimpleQueue
+from typing import Awaitable, Callable, Optional, Dict, Set, Tuple, Union
 from config import RESERVED_WORDS, API_ID, API_HASH
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    from json import loads as json_loads
+
 # Set up detailed logging with rotation
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -24,36 +31,213 @@ handler = logging.handlers.RotatingFileHandler(
     encoding='utf-8'
 )
 handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-logger.addHandler(handler)
+
+# The event loop only enqueues records; a listener thread does the disk writes and rotation
+_log_queue = SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, handler, respect_handler_level=True)
+_log_listener.start()
+# Drain queued records to disk before the interpreter exits
+atexit.register(_log_listener.stop)
 
 # Constants
 PREMIUM_USER = 'This account is already subscribed to Telegram Premium.'
 CHANNEL = 'Please enter a username assigned to a user.'
 NOT_FOUND = 'No Telegram users found.'
 
+# Precompiled patterns used on every check
+_USERNAME_RE = re.compile(r'[a-zA-Z][a-zA-Z0-9_]{4,31}')
+_AJINIT_RE = re.compile(r'ajInit\((\{.*?})\);', re.DOTALL)
+_TM_VALUE_RE = re.compile(r'<div[^>]*class="[^"]*tm-value[^"]*"[^>]*>(.*?)</div>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Marker shown on t.me pages of existing accounts
+_TME_CONTACT_MARKER = b'If you have Telegram, you can contact'
+
 # Telegram API Credentials (Now imported from config.py)
 
+# Process-wide cap on in-flight Fragment checks, shared by every batch
+_MAX_INFLIGHT = int(os.getenv("FRAGMENT_MAX_INFLIGHT", "16"))
+if _MAX_INFLIGHT < 1:
+    raise ValueError(f"FRAGMENT_MAX_INFLIGHT must be at least 1, got {_MAX_INFLIGHT}")
+# Created by _get_check_semaphore: asyncio primitives bind to the first loop that waits on them
+_check_semaphore: Optional[asyncio.Semaphore] = None
+
+# Fragment responses worth retrying: rate limiting and gateway hiccups
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_MAX_BACKOFF = 8
+
+# Budget for one check including its retries, counted once it holds a semaphore slot
+_CHECK_TIMEOUT = 20
+
+
+class AsyncTokenBucket:
+    """Token-bucket rate limiter: bursts up to `rate` requests, refilled at `rate` per `period`"""
+
+    def __init__(self, rate: float, period: float = 1.0):
+        if rate <= 0 or period <= 0:
+            raise ValueError(f"rate and period must be positive, got rate={rate}, period={period}")
+        # Hold at least one token, or fractional rates could never fill a whole one
+        self.capacity = max(1.0, rate)
+        self._fill_rate = rate / period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None  # created inside the loop that uses it
+
+    def reset(self):
+        """Refill the bucket and forget its lock so it can serve a new event loop"""
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._fill_rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._fill_rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+# Shared quota for every outgoing fragment.com / t.me request (requests per second)
+_RATE_LIMITER = AsyncTokenBucket(float(os.getenv("FRAGMENT_RATE_LIMIT", "10")), 1.0)
+
+# Recent results as {username: (result, expiry)} and checks currently in flight
+_RESULT_TTL = 300
+_RESULT_CACHE_MAX = 50_000
+_results_cache: Dict[str, Tuple[Optional[bool], float]] = {}
+_inflight: Dict[str, asyncio.Task] = {}
+_waiters: Dict[str, int] = {}
+
+
+def _finish_check(username: str, task: asyncio.Task):
+    """Done-callback: release the in-flight slot and remember the result"""
+    # A cancelled check may already have been replaced by a fresh one
+    if _inflight.get(username) is task:
+        del _inflight[username]
+    if task.cancelled() or task.exception() is not None:
+        return
+
+    now = time.monotonic()
+    # Entries share one TTL, so insertion order is expiry order: evict from the front
+    _results_cache.pop(username, None)
+    while _results_cache:
+        oldest = next(iter(_results_cache))
+        if len(_results_cache) < _RESULT_CACHE_MAX and _results_cache[oldest][1] > now:
+            break
+        del _results_cache[oldest]
+    _results_cache[username] = (task.result(), now + _RESULT_TTL)
+
+
+class _CheckFailed(Exception):
+    """A check ended without an answer; raised so the failure is not cached as a result"""
+
+
+class _RetriesExhausted(_CheckFailed):
+    """A check failed on every attempt"""
+
+
+def _retry_after(error: aiohttp.ClientResponseError) -> float:
+    """Seconds the server asked us to wait, or 0 when it sent no usable Retry-After"""
+    try:
+        return max(0.0, float((error.headers or {}).get('Retry-After', 0)))
+    except ValueError:  # HTTP-date form; fall back to our own backoff
+        return 0.0
+
+
+# Fragment API URL cached as (url, expiry); the ajInit URL rarely changes
+_API_URL_TTL = 3600
+_api_url_cache: Optional[Tuple[str, float]] = None
+_api_url_lock: Optional[asyncio.Lock] = None
+
+# Process-wide HTTP session so TCP+TLS handshakes are reused across checkers
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return the shared session, creating it lazily inside the running loop"""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        # Nearly all traffic goes to fragment.com and t.me, so the per-host cap is what
+        # bounds throughput; derive it from the check semaphore so checks never queue
+        # for a connection, and keep it below the total so one host cannot take the pool
+        # (16 in flight gives 32 per host and 128 in total)
+        connector = aiohttp.TCPConnector(
+            limit=8 * _MAX_INFLIGHT,
+            limit_per_host=2 * _MAX_INFLIGHT,
+            keepalive_timeout=75,
+            ttl_dns_cache=300
+        )
+        # A stalled socket gives its pool slot back long before the batch deadline
+        timeout = aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
+        _SESSION = aiohttp.ClientSession(connector=connector, timeout=timeout)
+    return _SESSION
+
+
+def _get_check_semaphore() -> asyncio.Semaphore:
+    """Return the in-flight check semaphore, creating it inside the running loop"""
+    global _check_semaphore
+    if _check_semaphore is None:
+        _check_semaphore = asyncio.Semaphore(_MAX_INFLIGHT)
+    return _check_semaphore
+
+
+def _get_api_url_lock() -> asyncio.Lock:
+    """Return the API URL refresh lock, creating it inside the running loop"""
+    global _api_url_lock
+    if _api_url_lock is None:
+        _api_url_lock = asyncio.Lock()
+    return _api_url_lock
+
+
+async def close_session():
+    """Close the shared session and drop cached state; register this once as the shutdown hook"""
+    global _SESSION, _api_url_cache, _check_semaphore, _api_url_lock
+    for task in _inflight.values():
+        task.cancel()
+    _inflight.clear()
+    _waiters.clear()
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+        # Give SSL transports a moment to close (recommended by the aiohttp docs)
+        await asyncio.sleep(0.25)
+    _SESSION = None
+    _api_url_cache = None
+    _results_cache.clear()
+    # Loop-bound primitives are rebuilt on first use, so a new event loop starts clean
+    _check_semaphore = None
+    _api_url_lock = None
+    _RATE_LIMITER.reset()
+
 
 class TelegramUsernameChecker:
     def __init__(self):
-        """Initialize checker with improved rate limiting for 40 concurrent users"""
-        self.session = aiohttp.ClientSession()
-        self.rate_semaphore = asyncio.Semaphore(40)  # Increased to 40 concurrent users
-        self.request_times = []
-        self.max_requests_per_window = 25  # Maximum requests per time window
-        self.time_window = 30  # Time window in seconds
-        self.base_delay = 0.5  # Reduced base delay
-
-        # Adaptive delay calculation
-        self._last_request_time = time.time()
-        self._request_count = 0
-        self._window_start = time.time()
+        """Initialize checker; request pacing is handled by the shared token bucket"""
+        self.base_delay = 0.5  # Base delay for retry backoff
 
         # API credentials (Now imported from config.py)
 
         # Cleanup old logs on initialization
         self._cleanup_old_logs()
 
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session used for every request"""
+        return _get_session()
+
     def _cleanup_old_logs(self):
         """Clean up old log files"""
         try:
@@ -62,178 +246,288 @@ class TelegramUsernameChecker:
                 for old_log in sorted(log_files, key=os.path.getctime)[:-2]:
                     try:
                         os.remove(old_log)
-                        logger.info(f"Removed old log file: {old_log}")
+                        logger.info("Removed old log file: %s", old_log)
                     except Exception as e:
-                        logger.error(f"Error removing log {old_log}: {e}")
+                        logger.error("Error removing log %s: %s", old_log, e)
         except Exception as e:
-            logger.error(f"Error during log cleanup: {e}")
-
-    async def _calculate_adaptive_delay(self):
-        """Calculate adaptive delay based on recent request patterns"""
-        current_time = time.time()
-
-        # Clean old request times
-        self.request_times = [t for t in self.request_times if current_time - t < self.time_window]
+            logger.error("Error during log cleanup: %s", e)
 
-        # Add current request
-        self.request_times.append(current_time)
+    async def check_fragment_api(self, username: str, retries=3) -> Optional[bool]:
+        """Check a username, sharing in-flight requests and recent results between callers"""
+        # Basic validation
+        if not _USERNAME_RE.fullmatch(username):
+            logger.debug('@%s invalid format', username)
+            return None
 
-        if len(self.request_times) >= self.max_requests_per_window:
-            # Calculate required delay to stay within rate limits
-            oldest_request = self.request_times[0]
-            time_diff = current_time - oldest_request
-            if time_diff < self.time_window:
-                return (self.time_window - time_diff) / self.max_requests_per_window + random.uniform(0.1, 0.3)
+        cached = _results_cache.get(username)
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
 
-        return self.base_delay
+        task = _inflight.get(username)
+        # Never attach to a check that is being torn down; its waiters would see CancelledError
+        if task is None or task.cancelled() or task.cancelling():
+            task = asyncio.create_task(self._check_fragment_api(username, retries))
+            _inflight[username] = task
+            task.add_done_callback(partial(_finish_check, username))
 
-    async def check_fragment_api(self, username: str, retries=3) -> Optional[bool]:
+        # Shield so one cancelled caller does not cancel the check for the others
+        _waiters[username] = _waiters.get(username, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except (_CheckFailed, asyncio.TimeoutError):
+            return None
+        finally:
+            # close_session may have cleared the count while we waited
+            remaining = _waiters.pop(username, 1) - 1
+            if remaining:
+                _waiters[username] = remaining
+            else:
+                # The last caller gave up; stop the check rather than spend requests on it
+                if not task.done():
+                    if _inflight.get(username) is task:
+                        del _inflight[username]
+                    task.cancel()
+
+    async def _check_fragment_api(self, username: str, retries: int) -> Optional[bool]:
         """Enhanced check with improved rate limiting and retries"""
-        async with self.rate_semaphore:
-            delay = await self._calculate_adaptive_delay()
-            await asyncio.sleep(delay)
-
+        loop = asyncio.get_running_loop()
+        async with _get_check_semaphore(), asyncio.timeout(_CHECK_TIMEOUT) as budget:
             for attempt in range(retries):
+                retry_after = 0.0
                 try:
-                    # Basic validation
-                    if not re.match(r'^[a-zA-Z][a-zA-Z0-9_]{4,31}$', username):
-                        logger.info(f'@{username} invalid format')
-                        return None
-
-                    async with self.session.get('https://fragment.com') as response:
-                        if response.status != 200:
-                            logger.warning(f'Fragment API status {response.status}, attempt {attempt + 1}')
-                            await asyncio.sleep(delay * (attempt + 1))
-                            continue
-
-                        text = await response.text()
-                        api_url = self._extract_api_url(text)
-                        if not api_url:
-                            continue
-
-                        result = await self._check_username_availability(api_url, username)
-                        if result is not None:
-                            return result
-
+                    api_url = await self._get_api_url()
+                    if api_url:
+                        # Any answer from Fragment is final; only failures below retry
+                        return await self._check_username_availability(api_url, username)
+
+                except _CheckFailed:
+                    # Not transient; retrying would get the same refusal
+                    raise
+                except aiohttp.ClientResponseError as e:
+                    retry_after = _retry_after(e)
+                    logger.debug("Fragment returned %s on attempt %d for @%s", e.status, attempt + 1, username)
                 except asyncio.TimeoutError:
-                    logger.warning(f"Timeout on attempt {attempt + 1} for @{username}")
-                except Exception as e:
-                    logger.error(f"Error checking @{username}: {e}")
+                    logger.debug("Timeout on attempt %d for @%s", attempt + 1, username)
+                except (aiohttp.ClientError, ValueError) as e:
+                    # Network and decode failures are routine per-username noise
+                    logger.debug("Error checking @%s: %s", username, e)
+                except Exception:
+                    logger.exception("Unexpected error checking @%s", username)
 
                 if attempt < retries - 1:
-                    await asyncio.sleep(delay * (attempt + 1))
+                    # Sleeping past the budget would only hold the semaphore slot until the timeout
+                    if retry_after > budget.when() - loop.time():
+                        break
+                    # Capped exponential backoff with jitter, but never sooner than the server asked
+                    delay = min(_MAX_BACKOFF, self.base_delay * 2 ** attempt) + random.uniform(0, 1)
+                    await asyncio.sleep(max(delay, retry_after))
+
+            raise _RetriesExhausted(username)
+
+    async def _get_api_url(self) -> Optional[str]:
+        """Return the cached Fragment API URL, fetching it again once the TTL expires"""
+        global _api_url_cache
+        if _api_url_cache is not None and time.monotonic() < _api_url_cache[1]:
+            return _api_url_cache[0]
+
+        async with _get_api_url_lock():
+            # Another task may have refreshed the URL while we waited
+            if _api_url_cache is not None and time.monotonic() < _api_url_cache[1]:
+                return _api_url_cache[0]
+
+            async with _RATE_LIMITER, self.session.get('https://fragment.com') as response:
+                if response.status != 200:
+                    logger.warning('Fragment API status %s', response.status)
+                    return None
+                body = await response.read()
 
-            return None
+            api_url = self._extract_api_url(body.decode('utf-8', errors='ignore'))
+            if api_url:
+                _api_url_cache = (api_url, time.monotonic() + _API_URL_TTL)
+            return api_url
 
     def _extract_api_url(self, text: str) -> Optional[str]:
-        """Extract API URL from Fragment page"""
+        """Extract API URL from the ajInit call in the raw Fragment page"""
         try:
-            tree = html.fromstring(text)
-            scripts = tree.xpath('//script/text()')
-            pattern = re.compile(r'ajInit\((\{.*?})\);', re.DOTALL)
-
-            for script in scripts:
-                match = pattern.search(script)
-                if match:
-                    data = json.loads(match.group(1))
-                    return f'https://fragment.com{data.get("apiUrl")}'
+            match = _AJINIT_RE.search(text)
+            if match:
+                data = json_loads(match.group(1))
+                return f'https://fragment.com{data.get("apiUrl")}'
 
             return None
         except Exception as e:
-            logger.error(f"Error extracting API URL: {e}")
+            logger.error("Error extracting API URL: %s", e)
             return None
 
     async def _check_username_availability(self, api_url: str, username: str) -> Optional[bool]:
-        """Check username availability with enhanced error handling"""
+        """Check username availability; raises on transient failures so the caller can retry"""
+        global _api_url_cache
         search_auctions = {'type': 'usernames', 'query': username, 'method': 'searchAuctions'}
 
-        async with self.session.post(api_url, data=search_auctions) as response:
-            if response.status == 429:  # Rate limit
-                return None
+        async with _RATE_LIMITER, self.session.post(api_url, data=search_auctions) as response:
+            if response.status in _RETRY_STATUSES:
+                response.raise_for_status()
+            if response.status != 200:
+                raise _CheckFailed(f'Fragment returned {response.status} for @{username}')
+            response_data = json_loads(await response.read())
 
-            try:
-                response_data = await response.json()
-                if not isinstance(response_data, dict) or 'html' not in response_data:
-                    return None
+        if not isinstance(response_data, dict) or 'html' not in response_data:
+            # Usually a rotated or expired API hash; refetch the URL on the next attempt
+            _api_url_cache = None
+            raise ValueError('unexpected Fragment response')
 
-                tree = html.fromstring(response_data['html'])
-                username_data = tree.xpath('//div[contains(@class, "tm-value")]')[:3]
+        username_data = self._extract_tm_values(response_data['html'])
 
-                if len(username_data) < 3:
-                    return None
+        if len(username_data) < 3:
+            return None
 
-                status = username_data[2].text_content()
-                price = username_data[1].text_content()
+        status = username_data[2]
+        price = username_data[1]
 
-                if price.isdigit():
-                    return None
+        if price.isdigit():
+            return None
 
-                if status == 'Unavailable':
-                    return await self._verify_unavailable(username)
+        if status == 'Unavailable':
+            return await self._verify_unavailable(username)
 
-                return None
+        return None
 
-            except Exception as e:
-                logger.error(f"Error processing response for @{username}: {e}")
-                return None
+    def _extract_tm_values(self, markup: str) -> list:
+        """Return the text of the first three tm-value cells without building a DOM"""
+        return [
+            unescape(_TAG_RE.sub('', value))
+            for value in _TM_VALUE_RE.findall(markup)[:3]
+        ]
 
     async def _verify_unavailable(self, username: str) -> bool:
-        """Verify unavailable status with t.me check"""
-        try:
-            async with self.session.get(f'https://t.me/{username}') as response:
-                if response.status in [403, 404, 410]:
-                    return True
-
-                text = await response.text()
-                return "If you have Telegram, you can contact" not in text
+        """Verify unavailable status with t.me check; failures propagate so they are retried"""
+        async with _RATE_LIMITER, self.session.get(f'https://t.me/{username}') as response:
+            if response.status in [403, 404, 410]:
+                return True
+            # A throttled page has no contact marker either; it must not read as available
+            if response.status in _RETRY_STATUSES:
+                response.raise_for_status()
+            if response.status != 200:
+                raise _CheckFailed(f't.me returned {response.status} for @{username}')
+
+            body = await response.read()
+            return _TME_CONTACT_MARKER not in body
+
+# Process-wide checker reused by every command for the bot's lifetime
+_CHECKER: Optional[TelegramUsernameChecker] = None
+
+
+def get_checker() -> TelegramUsernameChecker:
+    """Return the shared checker, creating it on first use"""
+    global _CHECKER
+    if _CHECKER is None:
+        _CHECKER = TelegramUsernameChecker()
+    return _CHECKER
+
+
+async def batch_check_usernames(
+    usernames: list,
+    on_result: Optional[Callable[[str, bool], Awaitable[None]]] = None,
+    timeout: float = 120,
+    on_progress: Optional[Callable[[int, int, dict], Awaitable[None]]] = None,
+    progress_interval: float = 1.2,
+    stop_when: Optional[Callable[[dict], bool]] = None
+) -> dict:
+    """Check usernames concurrently, passing each result to on_result as soon as it lands
+
+    on_progress receives (checked, total, results) at most once per progress_interval
+    seconds, which keeps callers that edit a chat message under Telegram's edit limit.
+    stop_when is called with the results so far; once it returns True the remaining
+    checks are cancelled. Checks start in input order, so pass names by priority.
+    """
+    checker = get_checker()
+    results = {}
 
-        except Exception as e:
-            logger.error(f"Error verifying @{username}: {e}")
-            return False
+    # Canonicalize and dedupe once so repeated names cost a single request
+    names = (name.strip().lstrip('@').lower() for name in usernames)
+    usernames = list(dict.fromkeys(name for name in names if name))
 
-    async def close(self):
-        """Cleanup resources"""
-        if not self.session.closed:
-            await self.session.close()
-
-async def batch_check_usernames(usernames: list, batch_size: int = 10) -> dict:
-    """Process usernames in optimized batches"""
-    checker = TelegramUsernameChecker()
-    results = {}
-    total_usernames = len(usernames)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    last_progress = loop.time()
+    checked = 0
+    found = 0
 
     try:
-        for i in range(0, total_usernames, batch_size):
-            batch = usernames[i:i + batch_size]
-            tasks = [checker.check_fragment_api(username) for username in batch]
+        # The group cancels and reaps anything still running when the block exits
+        async with asyncio.TaskGroup() as group:
+            tasks = {group.create_task(_safe_check(checker, username)): username for username in usernames}
+            pending = set(tasks)
+
+            # Consume results in completion order so callers can show them incrementally
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0, deadline - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.warning("Batch deadline reached, dropping %d unfinished checks", len(pending))
+                    break
+
+                for task in done:
+                    # A cancelled check is a missing result, not a reason to abort the batch
+                    result = None if task.cancelled() else task.result()
+                    if result is None:
+                        continue
+                    username = tasks[task]
+                    results[username] = result
+                    if result:
+                        found += 1
+                    if on_result is not None:
+                        await on_result(username, result)
 
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+                checked += len(done)
+                if stop_when is not None and stop_when(results):
+                    logger.info("Stop condition met, skipping %d remaining checks", len(pending))
+                    break
 
-            for username, result in zip(batch, batch_results):
-                if isinstance(result, Exception):
-                    logger.error(f"Error in batch for @{username}: {result}")
-                    continue
-                if result is not None:
-                    results[username] = result
+                if on_progress is not None and pending and loop.time() - last_progress >= progress_interval:
+                    last_progress = loop.time()
+                    await on_progress(checked, len(usernames), results)
 
-            # Adaptive delay between batches
-            if i + batch_size < total_usernames:
-                delay = 0.5 + (len(batch) / 20)  # Base delay + adjustment for batch size
-                await asyncio.sleep(delay)
+            for task in pending:
+                task.cancel()
 
     except Exception as e:
-        logger.error(f"Batch processing error: {e}")
-    finally:
-        await checker.close()
+        logger.error("Batch processing error: %s", e)
+
+    # Running counter instead of re-scanning results
+    logger.info("Checked %d/%d usernames, %d available", checked, len(usernames), found)
 
     return results
 
+
+async def _safe_check(checker: TelegramUsernameChecker, username: str) -> Optional[bool]:
+    """Run one check, logging failures so a single name cannot abort its TaskGroup"""
+    try:
+        return await checker.check_fragment_api(username)
+    except Exception:
+        # Expected failures are handled inside the check, so anything here is a bug
+        logger.exception("Unexpected error checking @%s", username)
+        return None
+
 async def main():
     usernames = ["test1", "test2", "test3", "test4", "test5"]
-    results = await batch_check_usernames(usernames, batch_size=5)
+    try:
+        results = await batch_check_usernames(usernames)
+    finally:
+        await close_session()
     for username, available in results.items():
         status = "available" if available else "unavailable"
-        logger.info(f"Username @{username} is {status}")
+        logger.info("Username @%s is %s", username, status)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:  # uvloop is optional and not available on Windows
+        loop_factory = None
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main())
\ No newline at end of file
@@ -1,4 +1,5 @@
 import random
+from functools import lru_cache
 from username_rules import (
     HURUF_RATA, 
     HURUF_TIDAK_RATA, 
@@ -24,6 +25,12 @@ class UsernameGenerator:
     @staticmethod
     def canon(base_name: str) -> list:
         """Generate usernames by swapping i/l characters"""
+        return list(UsernameGenerator._canon(base_name))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _canon(base_name: str) -> tuple:
+        """Cached i/l swap variants; immutable because every caller shares them"""
         generated = []
         for _ in range(30):
             if 'i' in base_name:
@@ -33,22 +40,34 @@ class UsernameGenerator:
             else:
                 new_name = base_name
             generated.append(new_name)
-        return generated
+        return tuple(generated)
 
     @staticmethod
     def sop(base_name: str) -> list:
         """Generate usernames by doubling existing letters (SOP)"""
+        return list(UsernameGenerator._sop(base_name))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _sop(base_name: str) -> tuple:
+        """Cached SOP variants backing sop()"""
         generated = []
         for pos in range(len(base_name)):
             # Double the current letter
             new_name = base_name[:pos] + base_name[pos] + base_name[pos:]
             generated.append(new_name)
-        return generated
+        return tuple(generated)
 
     @staticmethod
     def scanon(base_name: str) -> list:
         """Generate usernames by adding 's' suffix"""
-        return [base_name + "s" for _ in range(30)]
+        return list(UsernameGenerator._scanon(base_name))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _scanon(base_name: str) -> tuple:
+        """Cached suffix variants backing scanon()"""
+        return tuple(base_name + "s" for _ in range(30))
 
     @staticmethod
     def switch(base_name: str) -> list:
@@ -105,4 +124,52 @@ class UsernameGenerator:
                 else:
                     generated.append(base_name)
 
-        return generated
\ No newline at end of file
+        return generated
+
+    @staticmethod
+    def variant_map(base_name: str) -> dict:
+        """Generate every method's variants once, keyed by username type in priority order"""
+        # Lowercase once; every method only adds lowercase letters, so all output is lowercase
+        base_name = base_name.lower()
+        return {
+            UsernameTypes.Uncommon.SOP: frozenset(UsernameGenerator._sop(base_name)),
+            UsernameTypes.Uncommon.CANON: frozenset(UsernameGenerator._canon(base_name)),
+            UsernameTypes.Uncommon.SCANON: frozenset(UsernameGenerator._scanon(base_name)),
+            UsernameTypes.Common.TAMHUR: frozenset(UsernameGenerator.tamhur(base_name)),
+            UsernameTypes.Common.GANHUR: frozenset(UsernameGenerator.ganhur(base_name)),
+            UsernameTypes.Common.SWITCH: frozenset(UsernameGenerator.switch(base_name)),
+            UsernameTypes.Common.KURHUF: frozenset(UsernameGenerator.kurkuf(base_name)),
+        }
+
+    @staticmethod
+    def category_of(variants: dict) -> dict:
+        """Map every generated name to its type; the first type in priority order wins"""
+        categories = {}
+        for username_type, names in variants.items():
+            for name in names:
+                categories.setdefault(name, username_type)
+        return categories
+
+    @staticmethod
+    def generate_all(base_name: str, variants: dict = None) -> list:
+        """Generate usernames with every method in priority order, each name only once
+
+        To categorize results afterwards, build category_of(variant_map(base_name))
+        once instead: its keys are this same list and categorize reuses the dict.
+        """
+        if variants is None:
+            variants = UsernameGenerator.variant_map(base_name)
+        return list(UsernameGenerator.category_of(variants))
+
+    @staticmethod
+    def categorize(usernames, categories: dict) -> dict:
+        """Bucket usernames with the dict from category_of, one lookup each
+
+        Buckets follow priority order; a type left with no names after dedup has none.
+        """
+        buckets = {username_type: [] for username_type in dict.fromkeys(categories.values())}
+        for name in usernames:
+            username_type = categories.get(name)
+            if username_type is not None:
+                buckets[username_type].append(name)
+        return buckets
@@ -1,5 +1,5 @@
 import time
-from typing import Dict, Set, Tuple
+from typing import AbstractSet, Dict, Iterable, List, Set
 import asyncio
 import logging
 
@@ -7,15 +7,15 @@ logger = logging.getLogger(__name__)
 
 class UsernameStore:
     def __init__(self):
-        self._store: Dict[str, Set[Tuple[str, float]]] = {}  # base_name -> set of (generated_name, timestamp)
+        self._store: Dict[str, Dict[str, float]] = {}  # base_name -> {generated_name: timestamp}
         self._cleanup_task = None
         self._completed_generations: Set[str] = set()  # Track completed base_names
 
     def add_username(self, base_name: str, generated_name: str) -> None:
         """Add a generated username with current timestamp"""
         if base_name not in self._store:
-            self._store[base_name] = set()
-        self._store[base_name].add((generated_name, time.time()))
+            self._store[base_name] = {}
+        self._store[base_name][generated_name] = time.time()
         logger.info(f"Stored generated username '{generated_name}' for base name '{base_name}'")
 
     def mark_generation_complete(self, base_name: str) -> None:
@@ -28,11 +28,28 @@ class UsernameStore:
         if base_name not in self._store:
             logger.debug(f"No stored usernames found for base name '{base_name}'")
             return False
-        is_found = any(username == gen_name for gen_name, _ in self._store[base_name])
+        is_found = username in self._store[base_name]
         if is_found:
             logger.info(f"Username '{username}' was previously generated from '{base_name}'")
         return is_found
 
+    def get_generated_set(self, base_name: str) -> AbstractSet[str]:
+        """Return a live set view of usernames generated from base_name"""
+        return self._store.get(base_name, {}).keys()
+
+    def has_any(self, base_name: str) -> bool:
+        """Check if anything has been generated from base_name yet"""
+        return bool(self._store.get(base_name))
+
+    def filter_new(self, base_name: str, candidates: Iterable[str]) -> List[str]:
+        """Return candidates not yet generated from base_name, deduplicated and in order"""
+        # Keep the caller's priority order so checks still start with the preferred names
+        if not self.has_any(base_name):
+            # Nothing stored for this base, every candidate is new
+            return list(dict.fromkeys(candidates))
+        stored = self._store[base_name]
+        return [name for name in dict.fromkeys(candidates) if name not in stored]
+
     def cleanup_old_entries(self) -> None:
         """Remove entries that are complete and older than 5 minutes"""
         current_time = time.time()
@@ -46,7 +63,7 @@ class UsernameStore:
             # If generation is complete, check time
             if base_name in self._completed_generations:
                 # Get the most recent timestamp for this base_name
-                latest_timestamp = max(ts for _, ts in self._store[base_name])
+                latest_timestamp = max(self._store[base_name].values())
 
                 # If the most recent generation was more than 5 minutes ago
                 if latest_timestamp <= five_minutes_ago:
@@ -58,7 +75,7 @@ class UsernameStore:
 
             # For incomplete generations or those within 5 minutes
             current_entries = {
-                (name, ts) for name, ts in self._store[base_name]
+                name: ts for name, ts in self._store[base_name].items()
                 if ts > five_minutes_ago
             }
 
@@ -78,8 +95,24 @@ class UsernameStore:
         if total_removed > 0:
             logger.info(f"Cleaned up {total_removed} old username entries")
 
-    async def start_cleanup_task(self):
-        """Start periodic cleanup task"""
+    async def start_cleanup_task(self) -> asyncio.Task:
+        """Start the periodic cleanup in its own task and return it"""
+        # Own the task so stop_cleanup_task can never cancel whoever called us
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+        return self._cleanup_task
+
+    async def _cleanup_loop(self):
         while True:
             self.cleanup_old_entries()
-            await asyncio.sleep(60)  # Run cleanup every minute
\ No newline at end of file
+            await asyncio.sleep(60)  # Run cleanup every minute
+
+    async def stop_cleanup_task(self):
+        """Cancel the periodic cleanup task on shutdown"""
+        task, self._cleanup_task = self._cleanup_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass